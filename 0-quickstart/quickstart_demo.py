@@ -15,8 +15,12 @@ Last Updated: October 30, 2025
 import os
 from langchain.agents import create_agent
 from langchain.tools import tool
+from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.memory import InMemorySaver
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from langchain_core.globals import set_llm_cache
 
 # Check if OpenAI API key is set
 if not os.getenv("OPENAI_API_KEY"):
@@ -24,6 +28,23 @@ if not os.getenv("OPENAI_API_KEY"):
     print("Example: export OPENAI_API_KEY='your-key-here'")
     exit(1)
 
+# ============================================================================
+# LLM RESPONSE CACHE
+# ============================================================================
+# Set LLM_CACHE_PATH (e.g. ".langchain.db") to reuse answers to repeated prompts across runs.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+if LLM_CACHE_PATH:
+    from langchain_community.cache import SQLiteCache
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
+# ============================================================================
+# MODEL SETTINGS
+# ============================================================================
+# Set OPENAI_SERVICE_TIER=priority to opt in to OpenAI's faster processing tier.
+# It is billed at a higher rate, so it's left off unless you ask for it.
+SERVICE_TIER = os.getenv("OPENAI_SERVICE_TIER")
+
 
 print("="*70)
 print("PART 1: YOUR FIRST SIMPLE AGENT (FLIGHTS EDITION)")
@@ -49,13 +70,13 @@ def get_flight_status(flight_number: str) -> str:
 # ============================================================================
 # create_agent() is the modern v1.0 way to build agents.
 # It takes:
-#   - model: The LLM to use (e.g., "openai:gpt-4o")
+#   - model: The LLM to use (e.g., "openai:gpt-4o" or a ChatOpenAI instance)
 #   - tools: A list of tools the agent can call
 #   - system_prompt: Instructions for the agent's behavior
 #   - name: A descriptive name for the agent
 
 agent = create_agent(
-    model="openai:gpt-4o-mini",  # Using the mini model to save costs
+    model=ChatOpenAI(model="gpt-4o-mini", service_tier=SERVICE_TIER),  # Using the mini model to save costs
     tools=[get_flight_status],
     system_prompt="You are a helpful flight assistant.",
     name="simple_flight_agent"
@@ -85,6 +106,9 @@ print("="*70)
 # STEP 1: Write a detailed system prompt
 # ============================================================================
 # A good system prompt sets personality, rules, and instructions for tool use
+# Keep it static: every turn sends [system prompt] -> [history] -> [new message],
+# so an unchanged system prompt lets OpenAI reuse its cached prompt prefix.
+# Per-user details belong in tools/context, not in the system prompt.
 
 SYSTEM_PROMPT = """Your goal is to provide passengers with accurate and helpful flight information. You should be professional, but with a friendly and slightly witty tone.
 
@@ -100,17 +124,19 @@ Always confirm the flight number before providing details. If a user asks a gene
 # ============================================================================
 # These tools can access user-specific information like user_id
 
+# Mock data - in a real app, this would query a flight API
+# Built once at module level so tool calls don't rebuild it every time
+FLIGHT_DATA = {
+    "UA456": "Flight UA456 is on time, departing from Gate B12 at 8:45 PM.",
+    "AA123": "Flight AA123 is delayed by 30 minutes, departing from Gate C5 at 9:15 PM.",
+    "DL789": "Flight DL789 has been cancelled. Please contact airline for rebooking.",
+}
+
+
 @tool
 def get_flight_details(flight_number: str) -> str:
     """Gets flight details like status, gate, and time for a given flight number."""
-    # Mock data - in a real app, this would query a flight API
-    flight_data = {
-        "UA456": "Flight UA456 is on time, departing from Gate B12 at 8:45 PM.",
-        "AA123": "Flight AA123 is delayed by 30 minutes, departing from Gate C5 at 9:15 PM.",
-        "DL789": "Flight DL789 has been cancelled. Please contact airline for rebooking.",
-    }
-    
-    return flight_data.get(
+    return FLIGHT_DATA.get(
         flight_number.upper(),
         f"Flight {flight_number} information is not available at this time."
     )
@@ -127,29 +153,48 @@ class Context:
 # This tool uses runtime context to personalize responses
 from langchain.tools import ToolRuntime
 
+# Mock database - in a real app, query an actual database
+# MappingProxyType makes it read-only
+USER_AIRPORTS = MappingProxyType({
+    "user_abc": "JFK",
+    "user_xyz": "SFO",
+    "user_123": "LAX",
+})
+
+
+@lru_cache(maxsize=10_000)
+def lookup_home_airport(user_id: str) -> str:
+    """Looks up a user's home airport, remembering the answer per user."""
+    # With a real database, the cache saves a query on every turn after the first
+    # (you'd also want the entries to expire, since a user's home airport can change)
+    return USER_AIRPORTS.get(user_id, "unknown airport")
+
+
 @tool
 def get_user_home_airport(runtime: ToolRuntime[Context]) -> str:
     """Retrieves the user's home airport based on their user ID."""
-    user_id = runtime.context.user_id
-    
-    # Mock database lookup - in a real app, query an actual database
-    user_airports = {
-        "user_abc": "JFK",
-        "user_xyz": "SFO",
-        "user_123": "LAX",
-    }
-    
-    airport = user_airports.get(user_id, "unknown airport")
-    return f"Your home airport is {airport}."
+    return f"Your home airport is {lookup_home_airport(runtime.context.user_id)}."
 
 
 # ============================================================================
 # STEP 3: Set up memory with a checkpointer
 # ============================================================================
 # Memory allows the agent to remember the conversation
-# InMemorySaver stores conversation history in memory (use Redis/Postgres for production)
+# InMemorySaver stores conversation history in memory and loses it on exit.
+# If REDIS_URL is set, the Redis checkpointer is used instead: it batches its
+# writes and keeps conversations across restarts.
+#   pip install langgraph-checkpoint-redis
+#   export REDIS_URL="redis://localhost:6379"
+
+REDIS_URL = os.getenv("REDIS_URL")
 
-checkpointer = InMemorySaver()
+if REDIS_URL:
+    from langgraph.checkpoint.redis import RedisSaver
+    checkpointer = RedisSaver(redis_url=REDIS_URL)
+    checkpointer.setup()  # Creates the Redis indices on first run
+    print("\nUsing Redis checkpointer for memory")
+else:
+    checkpointer = InMemorySaver()
 
 
 # ============================================================================
@@ -160,9 +205,18 @@ checkpointer = InMemorySaver()
 #   - A detailed system prompt
 #   - Memory (via checkpointer)
 #   - Context awareness (via context_schema)
+#
+# prompt_cache_key routes every turn of this agent to the same OpenAI prompt
+# cache. OpenAI only caches prefixes of 1024 tokens or more, so the repeated
+# system prompt + history becomes a cache hit once the conversation passes that
+# (the three turns below stay under it).
 
 advanced_agent = create_agent(
-    model="openai:gpt-4o-mini",
+    model=ChatOpenAI(
+        model="gpt-4o-mini",
+        model_kwargs={"prompt_cache_key": "advanced_flight_agent"},
+        service_tier=SERVICE_TIER
+    ),
     system_prompt=SYSTEM_PROMPT,
     tools=[get_user_home_airport, get_flight_details],
     context_schema=Context,
@@ -178,6 +232,11 @@ advanced_agent = create_agent(
 # Each conversation needs a unique thread_id for memory management
 config = {"configurable": {"thread_id": "flight_convo_1"}}
 
+# Note: these three interactions are deliberately sent one at a time.
+# Each turn builds on the previous one (on the same thread), so they can't be
+# batched. Independent queries can be sent together with agent.batch() -
+# see Part 2 of 1-agents/agents_demo.py for an example.
+
 print("\n--- Interaction 1: User asks about their flight ---\n")
 print("User: What's the status of my flight home today?")
 
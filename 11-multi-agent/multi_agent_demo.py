@@ -17,14 +17,49 @@ Last Updated: October 30, 2025
 """
 
 import os
+import asyncio
+import json
+from contextvars import ContextVar
 from langchain.tools import tool
 from langchain.agents import create_agent
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage
+from langchain_core.globals import set_llm_cache
 
 # Check API key
 if not os.getenv("OPENAI_API_KEY"):
     print("ERROR: Please set your OPENAI_API_KEY environment variable")
     exit(1)
 
+# ============================================================================
+# LLM RESPONSE CACHE
+# ============================================================================
+# Set LLM_CACHE_PATH (e.g. ".langchain.db") to reuse answers to repeated prompts across runs.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+if LLM_CACHE_PATH:
+    from langchain_community.cache import SQLiteCache
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
+# ============================================================================
+# MODEL SETTINGS
+# ============================================================================
+# Set OPENAI_SERVICE_TIER=priority to opt in to OpenAI's faster processing tier.
+# It is billed at a higher rate, so it's left off unless you ask for it.
+SERVICE_TIER = os.getenv("OPENAI_SERVICE_TIER")
+
+# One model instance is shared by the supervisor and all sub-agents.
+# prompt_cache_key routes this demo's calls to the same OpenAI prompt cache.
+# OpenAI only caches prompt prefixes of 1024 tokens or more, and these system
+# prompts and tool schemas are far shorter, so caching only starts once a
+# conversation grows past that.
+model = ChatOpenAI(
+    model="gpt-4o-mini",
+    model_kwargs={"prompt_cache_key": "multi_agent_demo"},
+    service_tier=SERVICE_TIER
+)
+
+
 print("="*70)
 print("MULTI-AGENT SYSTEM DEMO")
 print("="*70)
@@ -38,7 +73,7 @@ print("\n[1/3] Creating specialized sub-agents...")
 
 # Calendar specialist
 calendar_agent = create_agent(
-    model="openai:gpt-4o-mini",
+    model=model,
     tools=[],  # In production, give it calendar API tools
     system_prompt=(
         "You are a calendar specialist. "
@@ -51,7 +86,7 @@ calendar_agent = create_agent(
 
 # Email specialist
 email_agent = create_agent(
-    model="openai:gpt-4o-mini",
+    model=model,
     tools=[],  # In production, give it email API tools
     system_prompt=(
         "You are an email specialist. "
@@ -64,7 +99,7 @@ email_agent = create_agent(
 
 # Research specialist
 research_agent = create_agent(
-    model="openai:gpt-4o-mini",
+    model=model,
     tools=[],  # In production, give it web search tools
     system_prompt=(
         "You are a research specialist. "
@@ -87,8 +122,59 @@ print("   • research_agent: Information gathering")
 
 print("\n[2/3] Wrapping sub-agents as tools...")
 
+# The wrappers are async: awaiting ainvoke() frees the event loop while a
+# sub-agent waits on OpenAI. When the supervisor asks for several sub-agents in
+# the same turn (e.g. "schedule a meeting and email the team"), their tool calls
+# run concurrently, so the turn takes about as long as the slowest sub-agent
+# instead of the sum of all of them.
+# The semaphore caps how many sub-agents can run at the same time.
+TOOL_CONCURRENCY_LIMIT = int(os.getenv("TOOL_CONCURRENCY_LIMIT", 4))
+sub_agent_slots = asyncio.Semaphore(TOOL_CONCURRENCY_LIMIT)
+
+
+# Speculative tool calls (opt-in with SPECULATIVE_TOOLS=1):
+# While the supervisor is still streaming its plan, each tool call is started
+# as soon as its arguments are complete, instead of waiting for the whole plan.
+# Started calls are kept here until the matching tool asks for the result.
+SPECULATIVE_TOOLS = os.getenv("SPECULATIVE_TOOLS") == "1"
+speculative_calls = {}  # (sub-agent name, request) -> asyncio.Task
+
+
+async def run_sub_agent(agent, request: str) -> str:
+    """Send a request to a sub-agent and return its final message."""
+    async with sub_agent_slots:
+        # "nostream" keeps the sub-agent's tokens out of the supervisor's stream
+        result = await agent.ainvoke(
+            {"messages": [{"role": "user", "content": request}]},
+            config={"tags": ["nostream"]}
+        )
+    return result["messages"][-1].content
+
+
+# Sub-agent calls made during the current supervisor run. If the supervisor
+# sends the same request to the same sub-agent twice in one run, the second
+# call reuses the first one's result instead of running the sub-agent again.
+# (A ContextVar keeps each run's calls separate when runs happen concurrently.)
+run_calls = ContextVar("run_calls", default=None)
+
+
+async def ask_sub_agent(agent, request: str) -> str:
+    """Reuse a matching call from this run or a speculative start, otherwise run the sub-agent."""
+    key = (agent.name, request)
+    calls = run_calls.get()
+    if calls is not None and key in calls:
+        return await calls[key]
+    
+    task = speculative_calls.pop(key, None)
+    if task is None:
+        task = asyncio.create_task(run_sub_agent(agent, request))
+    if calls is not None:
+        calls[key] = task
+    return await task
+
+
 @tool
-def schedule_event(request: str) -> str:
+async def schedule_event(request: str) -> str:
     """
     Schedule calendar events using natural language.
     Use for:
@@ -96,14 +182,11 @@ def schedule_event(request: str) -> str:
     - Checking availability
     - Managing appointments
     """
-    result = calendar_agent.invoke({
-        "messages": [{"role": "user", "content": request}]
-    })
-    return result["messages"][-1].content
+    return await ask_sub_agent(calendar_agent, request)
 
 
 @tool
-def manage_email(request: str) -> str:
+async def manage_email(request: str) -> str:
     """
     Handle email-related tasks.
     Use for:
@@ -111,14 +194,11 @@ def manage_email(request: str) -> str:
     - Checking inbox
     - Managing drafts
     """
-    result = email_agent.invoke({
-        "messages": [{"role": "user", "content": request}]
-    })
-    return result["messages"][-1].content
+    return await ask_sub_agent(email_agent, request)
 
 
 @tool
-def research_topic(request: str) -> str:
+async def research_topic(request: str) -> str:
     """
     Research and gather information on topics.
     Use for:
@@ -126,10 +206,7 @@ def research_topic(request: str) -> str:
     - Gathering data
     - Synthesizing information
     """
-    result = research_agent.invoke({
-        "messages": [{"role": "user", "content": request}]
-    })
-    return result["messages"][-1].content
+    return await ask_sub_agent(research_agent, request)
 
 
 print(" Sub-agents wrapped as tools")
@@ -141,28 +218,135 @@ print(" Sub-agents wrapped as tools")
 
 print("\n[3/3] Creating supervisor agent...")
 
+# The supervisor plans in "waves": tool calls made in the same turn run
+# concurrently, and a task that depends on another agent's result goes in a
+# later turn, once that result is available.
+#
+# The system prompt is a fixed constant and always comes first, so every call
+# starts with the same prefix and OpenAI can reuse its cached copy.
+# Anything that changes per request (dates, session ids...) belongs in the
+# user message, never in this prompt.
+SUPERVISOR_PROMPT = (
+    "You are a helpful AI coordinator. "
+    "You have access to specialized agents for calendar, email, and research tasks. "
+    "Choose the appropriate agent based on the user's request. "
+    "You may need to use multiple agents to complete complex tasks. "
+    "Plan the tasks first: call every agent whose task doesn't need another agent's result "
+    "together in the same turn. If a task needs another agent's output "
+    "(e.g. emailing a research summary), wait for that result and include it in the request."
+)
+
 supervisor = create_agent(
-    model="openai:gpt-4o-mini",
+    model=model,
     tools=[schedule_event, manage_email, research_topic],
-    system_prompt=(
-        "You are a helpful AI coordinator. "
-        "You have access to specialized agents for calendar, email, and research tasks. "
-        "Choose the appropriate agent based on the user's request. "
-        "You may need to use multiple agents to complete complex tasks."
-    ),
+    system_prompt=SUPERVISOR_PROMPT,
     name="supervisor"
 )
 
 print(" Supervisor agent ready\n")
 
+# Which sub-agent each supervisor tool calls (used for speculative starts)
+SUB_AGENT_TOOLS = {
+    "schedule_event": calendar_agent,
+    "manage_email": email_agent,
+    "research_topic": research_agent,
+}
+
+
+def start_speculative_call(tool_name: str, raw_args: str):
+    """
+    Start a sub-agent early once a streamed tool call's arguments are complete.
+    
+    Returns the key of the started call, or None if nothing was started.
+    """
+    agent = SUB_AGENT_TOOLS.get(tool_name)
+    try:
+        request = json.loads(raw_args)["request"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
+    key = (agent.name, request) if agent is not None else None
+    calls = run_calls.get() or {}
+    if key is None or key in speculative_calls or key in calls:
+        return None  # Unknown tool, or this call is already running
+    
+    print(f"  [Speculative] Starting {tool_name} early")
+    speculative_calls[key] = asyncio.create_task(run_sub_agent(agent, request))
+    return key
+
+
+async def run_supervisor(query: str, stream_answer: bool = False) -> str:
+    """
+    Run the supervisor on one query and return its final answer.
+    
+    With stream_answer=True the answer is also printed token by token as it's
+    generated, instead of appearing all at once at the end.
+    """
+    inputs = {"messages": [{"role": "user", "content": query}]}
+    run_calls.set({})  # Start a fresh set of sub-agent calls for this run
+    
+    if not SPECULATIVE_TOOLS and not stream_answer:
+        response = await supervisor.ainvoke(inputs)
+        return response["messages"][-1].content
+    
+    # Stream the run: "messages" gives the supervisor's tokens and tool calls as
+    # they are generated, "values" gives the full state after each step.
+    current_call = None  # [message id, index, tool name, args so far]
+    started = []  # Speculative calls started by this run
+    final_state = None
+    
+    def finish_current_call():
+        """The streamed tool call is complete: start it early and forget it."""
+        nonlocal current_call
+        if current_call is not None:
+            key = start_speculative_call(current_call[2], current_call[3])
+            if key is not None:
+                started.append(key)
+            current_call = None
+    
+    async for mode, data in supervisor.astream(inputs, stream_mode=["messages", "values"]):
+        if mode == "values":
+            final_state = data
+            continue
+        
+        chunk, metadata = data
+        if stream_answer and isinstance(chunk, AIMessage) and metadata.get("langgraph_node") == "model":
+            print(chunk.content, end="", flush=True)
+        
+        if not SPECULATIVE_TOOLS:
+            continue
+        
+        for call_chunk in getattr(chunk, "tool_call_chunks", None) or []:
+            key = (chunk.id, call_chunk.get("index"))
+            if current_call and key != tuple(current_call[:2]):
+                # A new tool call has begun, so the previous one is complete
+                finish_current_call()
+            if current_call is None:
+                current_call = [*key, call_chunk.get("name"), ""]
+            current_call[3] += call_chunk.get("args") or ""
+        
+        # The message's last chunk carries a finish_reason, and any other
+        # message means the model's message has ended: either way its last
+        # tool call is complete too
+        if current_call and (
+            chunk.id != current_call[0] or chunk.response_metadata.get("finish_reason")
+        ):
+            finish_current_call()
+    
+    # Anything this run started that is still waiting was never requested by
+    # the final plan (other runs may be using the registry at the same time)
+    for key in started:
+        task = speculative_calls.pop(key, None)
+        if task is not None:
+            task.cancel()
+            print(f"  [Speculative] Cancelled unused call to {key[0]}")
+    
+    return final_state["messages"][-1].content
+
+
 # ============================================================================
 # TEST THE MULTI-AGENT SYSTEM
 # ============================================================================
 
-print("="*70)
-print("TESTING MULTI-AGENT SYSTEM")
-print("="*70)
-
 test_scenarios = [
     (
         "Schedule a team meeting for tomorrow at 2pm",
@@ -182,43 +366,61 @@ test_scenarios = [
     ),
 ]
 
-for i, (query, expected) in enumerate(test_scenarios, 1):
-    print(f"\n{'─'*70}")
-    print(f"Test {i}: {query}")
-    print(f"Expected: {expected}")
-    print("─"*70)
+
+async def run_test_scenarios():
+    """Run all test scenarios through the supervisor concurrently."""
+    print("="*70)
+    print("TESTING MULTI-AGENT SYSTEM")
+    print("="*70)
     
-    response = supervisor.invoke({
-        "messages": [{"role": "user", "content": query}]
-    })
+    # The scenarios are independent, so they all run at once and the test
+    # phase takes about as long as the slowest scenario
+    answers = await asyncio.gather(*(run_supervisor(query) for query, _ in test_scenarios))
     
-    print(f"\nSupervisor: {response['messages'][-1].content}\n")
+    for i, ((query, expected), answer) in enumerate(zip(test_scenarios, answers), 1):
+        print(f"\n{'─'*70}")
+        print(f"Test {i}: {query}")
+        print(f"Expected: {expected}")
+        print("─"*70)
+        
+        print(f"\nSupervisor: {answer}\n")
+
 
 # ============================================================================
 # INTERACTIVE MODE
 # ============================================================================
 
-print("\n" + "="*70)
-print("INTERACTIVE MODE")
-print("="*70)
-print("Try tasks involving calendar, email, or research!")
-print("Type 'quit' to exit.\n")
-
-while True:
-    query = input("You: ").strip()
-    
-    if query.lower() in ['quit', 'exit', 'q']:
-        print("\nGoodbye!\n")
-        break
-    
-    if not query:
-        continue
-    
-    response = supervisor.invoke({
-        "messages": [{"role": "user", "content": query}]
-    })
+async def interactive_mode():
+    """Chat loop that reads input in a worker thread so the event loop stays free."""
+    print("\n" + "="*70)
+    print("INTERACTIVE MODE")
+    print("="*70)
+    print("Try tasks involving calendar, email, or research!")
+    print("Type 'quit' to exit.\n")
     
-    print(f"\nSupervisor: {response['messages'][-1].content}\n")
+    while True:
+        query = (await asyncio.to_thread(input, "You: ")).strip()
+        
+        if query.lower() in ['quit', 'exit', 'q']:
+            print("\nGoodbye!\n")
+            break
+        
+        if not query:
+            continue
+        
+        print("\nSupervisor: ", end="", flush=True)
+        await run_supervisor(query, stream_answer=True)
+        print("\n")
+
+
+async def main():
+    # Both parts share one event loop, since the async sub-agent tools
+    # (and their semaphore) belong to it
+    await run_test_scenarios()
+    await interactive_mode()
+
+
+asyncio.run(main())
 
 print("\n" + "="*70)
 print("KEY CONCEPTS")
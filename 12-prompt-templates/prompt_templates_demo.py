@@ -3,9 +3,10 @@ from langchain_openai import ChatOpenAI
 
 llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
 
-prompt = PromptTemplate(
-    input_variables=["topic"],
-    template="Explain {topic} in simple terms for a beginner."
+# Built once and reused for every format() call;
+# from_template reads the {topic} variable from the template itself
+prompt = PromptTemplate.from_template(
+    "Explain {topic} in simple terms for a beginner."
 )
 
 formatted_prompt = prompt.format(topic="LangChain")
@@ -5,7 +5,13 @@ class AIResponse(BaseModel):
     summary: str
     use_case: str
 
-llm = ChatOpenAI(model="gpt-4o-mini").with_structured_output(AIResponse)
+# json_schema + strict=True uses OpenAI's native structured outputs:
+# the model is constrained to emit JSON matching AIResponse exactly
+llm = ChatOpenAI(model="gpt-4o-mini").with_structured_output(
+    AIResponse,
+    method="json_schema",
+    strict=True
+)
 
 result = llm.invoke(
     "Explain LangChain and give one real-world use case."
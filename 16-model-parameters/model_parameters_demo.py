@@ -1,3 +1,4 @@
+import asyncio
 from langchain_openai import ChatOpenAI
 
 creative_llm = ChatOpenAI(
@@ -10,8 +11,17 @@ precise_llm = ChatOpenAI(
     temperature=0
 )
 
+async def run():
+    # The two calls are independent, so they run at the same time
+    return await asyncio.gather(
+        creative_llm.ainvoke("Write a metaphor for AI."),
+        precise_llm.ainvoke("Define artificial intelligence.")
+    )
+
+creative, precise = asyncio.run(run())
+
 print("Creative:")
-print(creative_llm.invoke("Write a metaphor for AI.").content)
+print(creative.content)
 
 print("\nPrecise:")
-print(precise_llm.invoke("Define artificial intelligence.").content)
+print(precise.content)
@@ -15,6 +15,8 @@ Last Updated: October 30, 2025
 """
 
 import os
+import sys
+import asyncio
 from langchain.chat_models import init_chat_model
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
@@ -90,15 +92,22 @@ print("\n--- Method 2: STREAM (Real-time Response) ---")
 # stream() returns the response piece by piece as it's generated
 # Great for showing progress to users
 
+# Writing straight to stdout skips print()'s argument handling for every token
+write, flush = sys.stdout.write, sys.stdout.flush
+
 print("\nStreaming response: ", end="", flush=True)
 for chunk in model.stream("Provide a brief analysis of current macroeconomic trends affecting the tech sector."):
-    print(chunk.content, end="", flush=True)
+    write(chunk.content)
+    flush()
 print("\n")
 
 
 print("\n--- Method 3: BATCH (Multiple Requests in Parallel) ---")
 # batch() processes multiple inputs efficiently at once
 # Perfect for analyzing multiple items (stocks, reports, etc.)
+# abatch() is the async version: all requests are sent at once on the event
+# loop, so the total wait is about the slowest request, not the sum of all.
+# (batch() does the same using a thread pool - use whichever fits your code.)
 
 prompts = [
     "Summarize the key points of Apple's latest earnings call in one sentence.",
@@ -107,7 +116,7 @@ prompts = [
 ]
 
 print("\nProcessing 3 prompts in batch...")
-responses = model.batch(prompts)
+responses = asyncio.run(model.abatch(prompts))
 
 for i, response in enumerate(responses, 1):
     print(f"\n{i}. {response.content}")
@@ -211,7 +220,7 @@ print("DEMO COMPLETE!")
 print("="*70)
 print("\nKey takeaways:")
 print("1. Models can be initialized with strings or class instances")
-print("2. invoke() for complete responses, stream() for real-time, batch() for multiple")
+print("2. invoke() for complete responses, stream() for real-time, batch()/abatch() for multiple")
 print("3. bind_tools() lets models call external functions")
 print("4. with_structured_output() forces models to return specific formats")
 print("5. When using models standalone, you handle tool execution manually")
@@ -1,5 +1,19 @@
+import os
+from langchain_core.globals import set_llm_cache
 from langchain_openai import ChatOpenAI
 
+# With REDIS_URL set, answers are kept in a semantic cache: a reworded
+# version of an earlier question is answered from Redis instead of the model
+if os.getenv("REDIS_URL"):
+    from langchain_community.cache import RedisSemanticCache
+    from langchain_openai import OpenAIEmbeddings
+
+    set_llm_cache(RedisSemanticCache(
+        redis_url=os.environ["REDIS_URL"],
+        embedding=OpenAIEmbeddings(model="text-embedding-3-small"),
+        score_threshold=0.2
+    ))
+
 llm = ChatOpenAI(model="gpt-4o-mini")
 
 question = "Should I use LangChain or plain OpenAI API?"
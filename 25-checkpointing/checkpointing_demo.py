@@ -1,15 +1,23 @@
 import json
 
+# orjson (pip install orjson) serializes much faster than the standard json
+# module, which adds up when an agent saves large checkpoints often.
+# Both produce the same JSON, so we fall back to json if it isn't installed.
+try:
+    import orjson
+    dumps, loads = orjson.dumps, orjson.loads
+except ImportError:
+    dumps, loads = (lambda obj: json.dumps(obj).encode()), json.loads
+
 state = {
     "step": 1,
     "message": "Processing started"
 }
 
-with open("checkpoint.json", "w") as f:
-    json.dump(state, f)
+with open("checkpoint.json", "wb") as f:
+    f.write(dumps(state))
 
-with open("checkpoint.json") as f:
-    restored_state = json.load(f)
+with open("checkpoint.json", "rb") as f:
+    restored_state = loads(f.read())
 
 print(restored_state)
-
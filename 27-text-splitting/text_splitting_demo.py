@@ -1,13 +1,16 @@
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_text_splitters import TokenTextSplitter
 
 text = """
 LangChain is a framework for building applications powered by language models.
 It supports agents, tools, memory, and retrieval augmented generation.
 """
 
-splitter = RecursiveCharacterTextSplitter(
-    chunk_size=50,
-    chunk_overlap=10
+# Splits on tokens using tiktoken's fast Rust tokenizer, so chunk sizes match
+# what the model actually counts (1 token is roughly 4 characters of English)
+splitter = TokenTextSplitter(
+    encoding_name="cl100k_base",
+    chunk_size=12,
+    chunk_overlap=2
 )
 
 chunks = splitter.split_text(text)
@@ -1,10 +1,18 @@
+from pydantic import BaseModel
 from langchain_openai import ChatOpenAI
 
-llm = ChatOpenAI(model="gpt-4o-mini")
+class ThoughtAction(BaseModel):
+    thought: str
+    action: str
+
+llm = ChatOpenAI(model="gpt-4o-mini").with_structured_output(ThoughtAction)
 
 question = "How should I learn LangChain?"
 
-thought = llm.invoke(f"Think step by step:\n{question}")
-action = llm.invoke(f"Give one clear action:\n{thought.content}")
+# One call returns both the reasoning and the action,
+# instead of a second call that re-reads the first answer
+result = llm.invoke(
+    f"Think step by step, then give one clear action:\n{question}"
+)
 
-print(action.content)
+print(result.action)
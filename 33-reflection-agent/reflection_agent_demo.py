@@ -1,11 +1,19 @@
+import asyncio
 from langchain_openai import ChatOpenAI
 
 llm = ChatOpenAI(model="gpt-4o-mini")
 
-answer = llm.invoke("Explain LangChain briefly.")
-reflection = llm.invoke(
-    f"Critique this answer and improve it:\n{answer.content}"
-)
+async def main():
+    # The drafts don't depend on each other, so they are generated concurrently
+    drafts = await llm.abatch(["Explain LangChain briefly."] * 3)
 
-print("Improved Answer:")
-print(reflection.content)
+    # A single reflection pass critiques all drafts and writes the improved answer
+    reflection = await llm.ainvoke(
+        "Critique these answers, pick the best one and improve it:\n"
+        + "\n---\n".join(draft.content for draft in drafts)
+    )
+
+    print("Improved Answer:")
+    print(reflection.content)
+
+asyncio.run(main())
@@ -15,18 +15,31 @@ Last Updated: October 30, 2025
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from langchain.agents import create_agent
 from langchain.tools import tool, ToolRuntime
 from langgraph.types import Command
 from pydantic import BaseModel, Field
 from typing import Literal
 from dataclasses import dataclass
+from langchain_core.globals import set_llm_cache
 
 # Check API key
 if not os.getenv("OPENAI_API_KEY"):
     print("ERROR: Please set your OPENAI_API_KEY environment variable")
     exit(1)
 
+# ============================================================================
+# LLM RESPONSE CACHE
+# ============================================================================
+# Set LLM_CACHE_PATH (e.g. ".langchain.db") to reuse answers to repeated prompts across runs.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+if LLM_CACHE_PATH:
+    from langchain_community.cache import SQLiteCache
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
 
 print("="*70)
 print("PART 1: BASIC TOOL DEFINITION")
@@ -38,6 +51,25 @@ print("="*70)
 # Tools are Python functions decorated with @tool
 # The docstring is CRITICAL - the agent uses it to decide when to call the tool
 
+# Mock server statuses - in real use, you'd ping the server
+# The mock tables are read-only (MappingProxyType), so caching the lookups below
+# is safe in this demo
+MOCK_SERVERS = MappingProxyType({
+    "192.168.1.1": "ONLINE",
+    "192.168.1.2": "OFFLINE",
+    "192.168.1.3": "MAINTENANCE"
+})
+
+
+# The lookup is cached, so when the agent checks the same server again
+# (a retry, or a later question) the finished reply comes straight from memory
+# (with a real ping you'd want the entries to expire, since a server's status changes)
+@lru_cache(maxsize=512)
+def lookup_server_status(server_ip: str) -> str:
+    """Looks up a server's status, remembering the reply per IP."""
+    return f"Server at {server_ip} is {MOCK_SERVERS.get(server_ip, 'UNKNOWN')}."
+
+
 @tool
 def check_server_status(server_ip: str) -> str:
     """Checks if a server is online and returns its status.
@@ -45,15 +77,7 @@ def check_server_status(server_ip: str) -> str:
     Args:
         server_ip: The IP address of the server to check.
     """
-    # Mock server status check - in real use, you'd ping the server
-    mock_servers = {
-        "192.168.1.1": "ONLINE",
-        "192.168.1.2": "OFFLINE",
-        "192.168.1.3": "MAINTENANCE"
-    }
-    
-    status = mock_servers.get(server_ip, "UNKNOWN")
-    return f"Server at {server_ip} is {status}."
+    return lookup_server_status(server_ip)
 
 
 # Create agent with the tool
@@ -116,6 +140,8 @@ print("="*70)
 # USING PYDANTIC FOR COMPLEX INPUT SCHEMAS
 # ============================================================================
 # For tools with many parameters or complex validation, use Pydantic
+# Pydantic compiles the model's validator once, when the class is defined, and
+# every tool call reuses it - there's no per-call schema building to cache.
 
 class NewAccountInput(BaseModel):
     """Input schema for creating a new user account."""
@@ -167,11 +193,11 @@ class HelpDeskContext:
 
 
 # Mock user permissions database
-USER_PERMISSIONS = {
+USER_PERMISSIONS = MappingProxyType({
     "user_123": "Admin",
     "user_456": "Standard",
     "user_789": "Guest"
-}
+})
 
 
 # Tool that accesses State (conversation history)
@@ -198,20 +224,27 @@ def check_user_permissions(runtime: ToolRuntime[HelpDeskContext]) -> str:
     return f"User {user_id} has '{permissions}' permissions."
 
 
+# Mock store contents
+MOCK_CONTACTS = MappingProxyType({
+    "user_123": "john.doe@company.com, ext. 5551",
+    "user_456": "jane.smith@company.com, ext. 5552",
+})
+
+
+# Cached on user_id only - runtime changes on every call, so it can't be part of the key
+# (with a real store you'd also want the entries to expire when a profile is updated)
+@lru_cache(maxsize=512)
+def lookup_contact_info(user_id: str) -> str:
+    """Looks up a user's contact info, remembering the reply per user."""
+    # In real use: user_info = runtime.store.get(("user_profiles",), user_id)
+    return f"Contact info for {user_id}: {MOCK_CONTACTS.get(user_id, 'Contact info not found')}"
+
+
 # Tool that accesses Store (long-term memory - simulated here)
 @tool
 def get_user_contact_info(user_id: str, runtime: ToolRuntime) -> str:
     """Looks up a user's contact info from the persistent store."""
-    # Mock store lookup
-    # In real use: user_info = runtime.store.get(("user_profiles",), user_id)
-    
-    mock_contacts = {
-        "user_123": "john.doe@company.com, ext. 5551",
-        "user_456": "jane.smith@company.com, ext. 5552",
-    }
-    
-    contact = mock_contacts.get(user_id, "Contact info not found")
-    return f"Contact info for {user_id}: {contact}"
+    return lookup_contact_info(user_id)
 
 
 # Tool that writes to State
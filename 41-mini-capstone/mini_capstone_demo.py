@@ -1,13 +1,14 @@
 from langchain_openai import ChatOpenAI
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationBufferWindowMemory
 
 llm = ChatOpenAI(model="gpt-4o-mini")
-memory = ConversationBufferMemory(return_messages=True)
+# Only the last 10 exchanges are sent to the model, so prompts stay bounded
+memory = ConversationBufferWindowMemory(k=10, return_messages=True)
 
 def assistant(user_input):
-    memory.chat_memory.add_user_message(user_input)
-    response = llm.invoke(memory.chat_memory.messages)
-    memory.chat_memory.add_ai_message(response.content)
+    history = memory.load_memory_variables({})["history"]
+    response = llm.invoke(history + [("human", user_input)])
+    memory.save_context({"input": user_input}, {"output": response.content})
     return response.content
 
 print(assistant("What is agentic AI?"))
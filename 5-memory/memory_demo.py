@@ -16,6 +16,7 @@ Last Updated: October 30, 2025
 """
 
 import os
+from functools import lru_cache
 from langchain.agents import create_agent, AgentState
 from langchain.tools import tool, ToolRuntime
 from langgraph.checkpoint.memory import InMemorySaver
@@ -26,12 +27,23 @@ from langchain.agents.middleware import (
     ModelRequest
 )
 from langgraph.types import Command
+from langchain_core.globals import set_llm_cache
 
 # Check API key
 if not os.getenv("OPENAI_API_KEY"):
     print("ERROR: Please set your OPENAI_API_KEY environment variable")
     exit(1)
 
+# ============================================================================
+# LLM RESPONSE CACHE
+# ============================================================================
+# Set LLM_CACHE_PATH (e.g. ".langchain.db") to reuse answers to repeated prompts across runs.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+if LLM_CACHE_PATH:
+    from langchain_community.cache import SQLiteCache
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
 
 print("="*70)
 print("PART 1: BASIC MEMORY WITH CHECKPOINTER")
@@ -129,22 +141,44 @@ print("="*70)
 # ============================================================================
 # As conversations grow, they exceed the model's context window
 # Trimming removes old messages to make space for new ones
+#
+# Counting messages treats a one-word reply the same as a long explanation,
+# so instead we count tokens (with tiktoken, OpenAI's tokenizer) and keep as
+# many recent messages as fit in a token budget. Fewer input tokens means
+# lower cost and a faster response.
 
+import tiktoken
 from langchain.messages import RemoveMessage
 from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from typing import Any
 
+# Kept small so the demo below actually trims - real apps use thousands
+MAX_HISTORY_TOKENS = 300
+
+encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+
+
 @before_model
 def trim_conversation_history(state: AgentState, runtime) -> dict[str, Any] | None:
-    """Keep the system prompt and the last 4 messages."""
+    """Keep the first message and the most recent messages that fit in MAX_HISTORY_TOKENS."""
     messages = state["messages"]
     
-    # Only trim if the conversation is long enough
-    if len(messages) <= 5:
+    # Count the tokens in every message in one batched call
+    token_counts = [len(tokens) for tokens in encoding.encode_batch([m.text for m in messages])]
+
+    # Only trim if the conversation is over budget
+    if len(messages) <= 2 or sum(token_counts) <= MAX_HISTORY_TOKENS:
         return None  # No changes needed
 
-    # Keep the first message (system prompt) and the last four
-    new_history = [messages[0]] + messages[-4:]
+    # Always keep the first message and the newest one, then walk backwards
+    # adding older messages until the budget runs out
+    budget = MAX_HISTORY_TOKENS - token_counts[0] - token_counts[-1]
+    keep_from = len(messages) - 1
+    while keep_from > 1 and token_counts[keep_from - 1] <= budget:
+        keep_from -= 1
+        budget -= token_counts[keep_from]
+
+    new_history = [messages[0]] + messages[keep_from:]
 
     print(f"  [Trimming] Reduced {len(messages)} messages to {len(new_history)} messages")
 
@@ -169,10 +203,21 @@ trimming_agent = create_agent(
 print("\n--- Test: Message trimming (simulating long conversation) ---")
 config = {"configurable": {"thread_id": "long_conversation"}}
 
+# Each turn sends a ~70-word note, and every word is at least one token, so
+# the user messages alone pass MAX_HISTORY_TOKENS by turn 5 at the latest
+# (the assistant's replies usually push it over sooner).
+TRIP_NOTE = (
+    "Here is some background for our chat. I am planning a two-week trip through "
+    "Portugal in the spring, starting in Lisbon and ending in Porto. I like small "
+    "museums, long walks, local food markets and travelling by train rather than "
+    "by car, and I would rather avoid crowded tourist spots where I can. Please "
+    "keep all of this in mind and answer in two or three sentences."
+)
+
 # Simulate multiple interactions
 for i in range(7):
     response = trimming_agent.invoke(
-        {"messages": [{"role": "user", "content": f"Message number {i+1}"}]},
+        {"messages": [{"role": "user", "content": f"Message number {i+1}. {TRIP_NOTE}"}]},
         config
     )
 
@@ -279,11 +324,18 @@ print("="*70)
 # USING MEMORY IN DYNAMIC PROMPTS
 # ============================================================================
 
+# The prompt only depends on the student's name, so each name's prompt is
+# built once and reused on every later turn
+@lru_cache(maxsize=256)
+def tutor_prompt_for(student_name: str) -> str:
+    """Build the tutor prompt for one student."""
+    return f"You are a friendly and encouraging tutor. Always address the user as {student_name}."
+
+
 @dynamic_prompt
 def personalized_tutor_prompt(request: ModelRequest) -> str:
     """Create a personalized prompt based on state."""
-    student_name = request.state.get("student_name", "Student")
-    return f"You are a friendly and encouraging tutor. Always address the user as {student_name}."
+    return tutor_prompt_for(request.state.get("student_name", "Student"))
 
 
 personalized_agent = create_agent(
@@ -315,7 +367,7 @@ print("2. InMemorySaver for development, Postgres/Redis for production")
 print("3. Each conversation needs a unique thread_id")
 print("4. Same thread_id = agent remembers, different thread_id = fresh start")
 print("5. Custom state schemas add fields beyond messages")
-print("6. Message trimming removes old messages to manage context length")
+print("6. Message trimming removes old messages to keep the context within a token budget")
 print("7. Summarization condenses old messages instead of deleting them")
 print("8. Tools can read state with ToolRuntime and write with Command")
 print("9. Dynamic prompts can use state for personalization")
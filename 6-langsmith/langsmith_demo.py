@@ -20,9 +20,12 @@ Last Updated: October 30, 2025
 """
 
 import os
+from functools import lru_cache
+from types import MappingProxyType
 from langchain_core.messages import HumanMessage
 from langchain_core.tools import tool
 from langchain.agents import create_agent
+from langchain_core.globals import set_llm_cache
 
 # ============================================================================
 # STEP 1: VERIFY API KEYS
@@ -57,11 +60,46 @@ else:
     print()
 
 
+# ============================================================================
+# LLM RESPONSE CACHE
+# ============================================================================
+# Set LLM_CACHE_PATH (e.g. ".langchain.db") to reuse answers to repeated prompts across runs.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+if LLM_CACHE_PATH:
+    from langchain_community.cache import SQLiteCache
+    set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
+
 # ============================================================================
 # STEP 2: DEFINE TOOLS
 # ============================================================================
 # This tool provides weather information for different cities
 
+# Mock weather data for demonstration
+# In production, you'd call a real weather API
+WEATHER_DATA = MappingProxyType({
+    "philadelphia": "Sunny and 72°F with light winds",
+    "new york": "Cloudy with a chance of rain, 65°F",
+    "san francisco": "Foggy and cool, 58°F",
+    "seattle": "Rainy as always, 55°F",
+    "boston": "Clear skies, 68°F",
+    "chicago": "Windy and cold, 52°F",
+})
+
+
+# Repeated questions about the same city are answered from this cache
+# (with a real weather API you'd also want the entries to expire)
+@lru_cache(maxsize=512)
+def lookup_weather(city: str) -> str:
+    """Look up the weather for a city, remembering the answer."""
+    city_lower = city.lower()
+    if city_lower in WEATHER_DATA:
+        return f"The weather in {city} is: {WEATHER_DATA[city_lower]}"
+    else:
+        return f"Weather data for {city} is not available. It's probably nice though!"
+
+
 @tool
 def get_weather(city: str) -> str:
     """Get the current weather for a given city.
@@ -72,22 +110,7 @@ def get_weather(city: str) -> str:
     Returns:
         A string describing the weather
     """
-    # Mock weather data for demonstration
-    # In production, you'd call a real weather API
-    weather_data = {
-        "philadelphia": "Sunny and 72°F with light winds",
-        "new york": "Cloudy with a chance of rain, 65°F",
-        "san francisco": "Foggy and cool, 58°F",
-        "seattle": "Rainy as always, 55°F",
-        "boston": "Clear skies, 68°F",
-        "chicago": "Windy and cold, 52°F",
-    }
-    
-    city_lower = city.lower()
-    if city_lower in weather_data:
-        return f"The weather in {city} is: {weather_data[city_lower]}"
-    else:
-        return f"Weather data for {city} is not available. It's probably nice though!"
+    return lookup_weather(city)
 
 
 # ============================================================================
@@ -116,24 +139,30 @@ test_queries = [
     "Can you check the weather in Seattle and San Francisco?",
 ]
 
-for i, query in enumerate(test_queries, 1):
+# The queries are independent, so agent.batch() sends them all at once.
+# Total time is roughly the slowest query instead of the sum of all three.
+# return_exceptions=True keeps one failing query from hiding the other results.
+results = agent.batch(
+    [{"messages": [HumanMessage(content=query)]} for query in test_queries],
+    config=[
+        {"configurable": {"thread_id": f"test-{i}"}}
+        for i in range(1, len(test_queries) + 1)
+    ],
+    return_exceptions=True
+)
+
+for i, (query, result) in enumerate(zip(test_queries, results), 1):
     print("─" * 70)
     print(f"Test {i}: {query}")
     print("─" * 70)
     
-    try:
-        # Invoke the agent
-        result = agent.invoke(
-            {"messages": [HumanMessage(content=query)]},
-            config={"configurable": {"thread_id": f"test-{i}"}}
-        )
-        
-        # Extract final response
-        final_message = result["messages"][-1]
-        print(f"\n Response: {final_message.content}\n")
-        
-    except Exception as e:
-        print(f"\n Error: {str(e)}\n")
+    if isinstance(result, Exception):
+        print(f"\n Error: {str(result)}\n")
+        continue
+    
+    # Extract final response
+    final_message = result["messages"][-1]
+    print(f"\n Response: {final_message.content}\n")
 
 print("=" * 70)
 print("TESTING COMPLETE!")
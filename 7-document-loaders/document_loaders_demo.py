@@ -71,16 +71,23 @@ except Exception as e:
 # ============================================================================
 # RecursiveCharacterTextSplitter breaks documents into smaller pieces
 # This improves retrieval accuracy and fits within embedding limits
+#
+# Chunks are measured in tokens (with the same tokenizer as the embedding
+# model) rather than characters, so every chunk is a predictable size for the
+# model. The recursive splitter already breaks at paragraph and sentence
+# boundaries, so no overlap is needed: overlapping chunks would embed and store
+# the same text twice without improving retrieval.
 
 print("\n[2/5] Splitting into chunks...")
-print(f"   Chunk size: 1000 characters")
-print(f"   Chunk overlap: 200 characters")
+print(f"   Chunk size: 400 tokens")
+print(f"   Chunk overlap: 0 tokens")
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-text_splitter = RecursiveCharacterTextSplitter(
-    chunk_size=1000,      # Maximum characters per chunk
-    chunk_overlap=200     # Overlap between chunks to preserve context
+text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+    encoding_name="cl100k_base",  # Tokenizer used by text-embedding-3-small
+    chunk_size=400,               # Maximum tokens per chunk
+    chunk_overlap=0               # No repeated text between chunks
 )
 
 chunks = text_splitter.split_documents(documents)
@@ -94,14 +101,28 @@ if len(chunks) > 0:
 # ============================================================================
 # Embeddings convert text into numerical vectors
 # OpenAI's text-embedding-3-small is cost-effective and high quality
+#
+# CacheBackedEmbeddings saves each vector to disk, keyed by a hash of the chunk
+# text. Re-running this script only pays OpenAI for chunks that have changed.
+#   pip install langchain-classic
+
+EMBEDDING_CACHE_DIR = "./embedding_cache"
 
 print("\n[3/5] Initializing OpenAI embeddings...")
 print(f"   Model: text-embedding-3-small")
 print(f"   Dimensions: 1536")
+print(f"   Cache: {EMBEDDING_CACHE_DIR}")
 
 from langchain_openai import OpenAIEmbeddings
-
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+from langchain_classic.embeddings import CacheBackedEmbeddings
+from langchain_classic.storage import LocalFileStore
+
+embeddings = CacheBackedEmbeddings.from_bytes_store(
+    OpenAIEmbeddings(model="text-embedding-3-small"),
+    LocalFileStore(EMBEDDING_CACHE_DIR),
+    namespace="text-embedding-3-small",  # Keeps vectors from different models apart
+    query_embedding_cache=True           # Cache the test query's vector as well
+)
 print(" Ready")
 
 # ============================================================================
@@ -109,20 +130,54 @@ print(" Ready")
 # ============================================================================
 # ChromaDB stores the chunks and their embeddings
 # The database is saved to disk for reuse
+#
+# Chroma indexes the vectors with HNSW (a graph index), so searches don't scan
+# every chunk. The defaults suit small collections like this one; for very large
+# ones you can tune it through collection_metadata, e.g.
+#   {"hnsw:M": 32, "hnsw:construction_ef": 200, "hnsw:search_ef": 64}
+# where a higher search_ef trades query speed for recall.
+#
+# A hash of the chunks is saved next to the database. If neither the PDF nor the
+# splitter settings changed since the last run, the hash matches and the
+# existing database is reused. Otherwise the old database is deleted and rebuilt,
+# so re-running the script never stores the same chunks twice.
 
 print("\n[4/5] Creating vector database...")
 print(f"   Database location: {PERSIST_DIR}")
-print(f"   This may take a moment...")
 
+import hashlib
+import shutil
 from langchain_community.vectorstores import Chroma
 
+HASH_FILE = os.path.join(PERSIST_DIR, ".source_hash")
+
+source_hash = hashlib.sha256(
+    "\0".join(chunk.page_content for chunk in chunks).encode("utf-8")
+).hexdigest()
+
+stored_hash = None
+if os.path.exists(HASH_FILE):
+    with open(HASH_FILE) as f:
+        stored_hash = f.read().strip()
+
 try:
-    vectorstore = Chroma.from_documents(
-        documents=chunks,
-        embedding=embeddings,
-        persist_directory=PERSIST_DIR
-    )
-    print(f" Stored {len(chunks)} chunks in ChromaDB")
+    if stored_hash == source_hash:
+        vectorstore = Chroma(
+            persist_directory=PERSIST_DIR,
+            embedding_function=embeddings
+        )
+        print(f" Database is up to date - reusing {len(chunks)} stored chunks")
+    else:
+        print(f"   This may take a moment...")
+        shutil.rmtree(PERSIST_DIR, ignore_errors=True)  # Drop chunks from an older version
+        vectorstore = Chroma.from_documents(
+            documents=chunks,
+            embedding=embeddings,
+            persist_directory=PERSIST_DIR
+        )
+        with open(HASH_FILE, "w") as f:
+            f.write(source_hash)
+        print(f" Stored {len(chunks)} chunks in ChromaDB")
     
 except Exception as e:
     print(f"\n ERROR creating vector store: {e}")
@@ -140,7 +195,10 @@ print("\n[5/5] Testing query...")
 print(f"   Query: '{TEST_QUERY}'")
 print(f"   Retrieving top 3 results...")
 
-results = vectorstore.similarity_search(TEST_QUERY, k=3)
+# One search returns both the documents and their scores, so the query is
+# only embedded and searched once
+results_with_scores = vectorstore.similarity_search_with_score(TEST_QUERY, k=3)
+results = [doc for doc, _ in results_with_scores]
 print(f" Found {len(results)} results\n")
 
 for i, doc in enumerate(results, 1):
@@ -151,7 +209,6 @@ for i, doc in enumerate(results, 1):
 
 # Show similarity scores
 print("Checking similarity scores (lower = more similar)...")
-results_with_scores = vectorstore.similarity_search_with_score(TEST_QUERY, k=3)
 for i, (doc, score) in enumerate(results_with_scores, 1):
     print(f"   Result {i} score: {score:.4f}")
 
@@ -183,8 +240,8 @@ print("   • Each Document has .page_content (text) and .metadata (info)")
 
 print("\n2. TEXT SPLITTING:")
 print("   • Breaks documents into smaller chunks")
-print("   • chunk_size=1000: Max characters per chunk")
-print("   • chunk_overlap=200: Overlap preserves context")
+print("   • chunk_size=400: Max tokens per chunk")
+print("   • chunk_overlap=0: No text is embedded twice")
 print("   • Tries to split at natural boundaries (paragraphs, sentences)")
 
 print("\n3. EMBEDDINGS:")
@@ -192,6 +249,7 @@ print("   • Convert text into numerical vectors (1536 dimensions)")
 print("   • Similar text = similar vectors")
 print("   • text-embedding-3-small: Cost-effective, high quality")
 print("   • Cost: ~$0.02 per 1M tokens (very cheap!)")
+print("   • Cached on disk, so unchanged chunks are never re-embedded")
 
 print("\n4. CHROMADB:")
 print("   • Vector database for storing embeddings")
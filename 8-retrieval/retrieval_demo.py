@@ -48,9 +48,19 @@ print("\n[1/7] Loading vector store...")
 
 from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
+from langchain_classic.embeddings import CacheBackedEmbeddings
+from langchain_classic.storage import LocalFileStore
 
 # IMPORTANT: Use the SAME embedding model as when creating the store
-embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
+# Every method below searches for the same query, so with the disk cache
+# shared with 7-document-loaders it is embedded once instead of on every search.
+#   pip install langchain-classic
+embeddings = CacheBackedEmbeddings.from_bytes_store(
+    OpenAIEmbeddings(model="text-embedding-3-small"),
+    LocalFileStore("./embedding_cache"),
+    namespace="text-embedding-3-small",
+    query_embedding_cache=True
+)
 vectorstore = Chroma(
     persist_directory="./chroma_db",
     embedding_function=embeddings
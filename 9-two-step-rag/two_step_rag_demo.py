@@ -17,6 +17,8 @@ Last Updated: October 30, 2025
 """
 
 import os
+import asyncio
+from functools import lru_cache
 from langchain.agents import create_agent
 from langchain.tools import tool
 from langchain_community.vectorstores import Chroma
@@ -59,11 +61,19 @@ print(" Vector store loaded")
 
 print("\n[2/3] Creating search tool...")
 
+# Query embeddings are cached, so a repeated query skips the embedding API call
+# and goes straight to the vector search.
+@lru_cache(maxsize=1024)
+def embed_query(query: str) -> tuple[float, ...]:
+    """Embed a query once and remember the vector."""
+    return tuple(embeddings.embed_query(query))
+
+
 @tool
 def search_knowledge_base(query: str) -> str:
     """Search the knowledge base for relevant information."""
     # Retrieve top 3 most relevant chunks
-    docs = vectorstore.similarity_search(query, k=3)
+    docs = vectorstore.similarity_search_by_vector(list(embed_query(query)), k=3)
     
     # Combine the chunks into one context string
     return "\n\n".join(doc.page_content for doc in docs)
@@ -101,15 +111,24 @@ test_queries = [
     "What are the key findings?",
 ]
 
-for i, query in enumerate(test_queries, 1):
+# The test questions don't depend on each other, so we send them all at once
+# with ainvoke() + asyncio.gather(). The waits on OpenAI overlap, so the whole
+# test takes about as long as the slowest question instead of the sum of all three.
+async def run_test_queries():
+    """Run every test query concurrently and return the responses in order."""
+    return await asyncio.gather(*(
+        agent.ainvoke({"messages": [{"role": "user", "content": query}]})
+        for query in test_queries
+    ))
+
+
+responses = asyncio.run(run_test_queries())
+
+for i, (query, response) in enumerate(zip(test_queries, responses), 1):
     print(f"\n{'─'*70}")
     print(f"Question {i}: {query}")
     print("─"*70)
     
-    response = agent.invoke({
-        "messages": [{"role": "user", "content": query}]
-    })
-    
     print(f"\nAnswer: {response['messages'][-1].content}\n")
 
 # ============================================================================
@@ -6,5 +6,6 @@ from langchain.embeddings import OpenAIEmbeddings
 
 texts = ["Hello world", "LangChain is powerful"]
 embeddings_model = OpenAIEmbeddings()
-vectors = [embeddings_model.embed(text) for text in texts]
+# One request embeds the whole list
+vectors = embeddings_model.embed_documents(texts)
 print("Vector embeddings:", vectors)